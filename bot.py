@@ -164,12 +164,13 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         # Определяем запрос: кнопка или произвольный вопрос
         query = BUTTON_QUERIES.get(user_message, user_message)
 
-        # Получаем контекст из RAG
-        context_text = rag_engine.get_context(query)
+        # Получаем контекст из RAG (в отдельном потоке, чтобы не блокировать
+        # event loop, пока обрабатываются сообщения других пользователей)
+        context_text = await asyncio.to_thread(rag_engine.get_context, query)
         logger.info(f"Контекст получен ({len(context_text)} символов)")
 
-        # Отправляем запрос в Groq API
-        answer = ask_llm(context_text, query)
+        # Отправляем запрос в Groq API (синхронный клиент — тоже в потоке)
+        answer = await asyncio.to_thread(ask_llm, context_text, query)
 
         # Обрезаем ответ если он слишком длинный для Telegram
         if len(answer) > 4000:
@@ -209,7 +210,7 @@ def main() -> None:
     logger.info("=" * 60)
 
     # Проверяем наличие данных в базе знаний
-    doc_count = rag_engine.collection.count()
+    doc_count = rag_engine.count
     if doc_count == 0:
         logger.warning(
             "База знаний пуста! "
@@ -218,8 +219,14 @@ def main() -> None:
     else:
         logger.info(f"В базе знаний {doc_count} записей")
 
-    # Создаём приложение бота
-    app = ApplicationBuilder().token(TELEGRAM_BOT_TOKEN).build()
+    # Создаём приложение бота (обновления обрабатываются параллельно,
+    # иначе сообщения других пользователей ждут окончания текущего ответа)
+    app = (
+        ApplicationBuilder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(True)
+        .build()
+    )
 
     # Регистрируем обработчики
     app.add_handler(CommandHandler("start", start_command))
@@ -4,8 +4,11 @@
 import os
 from dotenv import load_dotenv
 
-# Загружаем переменные из .env файла
-load_dotenv()
+# Загружаем переменные из .env файла (один раз на процесс — повторный
+# импорт или importlib.reload не разбирают .env заново)
+if not os.environ.get("_CONFIG_LOADED"):
+    load_dotenv()
+    os.environ["_CONFIG_LOADED"] = "1"
 
 # Токен Telegram бота (получить через @BotFather)
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
@@ -31,12 +34,15 @@ if not GROQ_API_KEY:
 # Пути к директориям
 KNOWLEDGE_BASE_DIR = os.path.join(os.path.dirname(__file__), "knowledge_base")
 CHROMA_DB_DIR = os.path.join(os.path.dirname(__file__), "chroma_db")
+DOCS_CACHE_PATH = os.path.join(CHROMA_DB_DIR, "docs_cache.pkl")  # Кэш текстов для поиска
 
 # Параметры RAG
 CHUNK_SIZE = 1500         # Размер чанка в символах (крупные чанки сохраняют контекст)
 CHUNK_OVERLAP = 300       # Перекрытие между чанками
 TOP_K_RESULTS = 8         # Количество релевантных чанков для контекста
+VECTOR_MAX_DISTANCE = 0.75  # Максимальное косинусное расстояние для векторных результатов
 EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"  # Мультиязычная модель
+QUERY_EMBEDDING_CACHE_SIZE = 1024  # Сколько эмбеддингов запросов держать в LRU-кэше
 
 # Параметры Groq
 GROQ_MODEL = "llama-3.1-8b-instant"
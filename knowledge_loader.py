@@ -31,7 +31,7 @@ def main():
 
     # Создаём экземпляр RAG движка и загружаем базу знаний
     from rag_engine import RAGEngine
-    rag = RAGEngine()
+    rag = RAGEngine(bulk_load=True)
     stats = rag.load_knowledge_base()
 
     # Выводим статистику
@@ -3,18 +3,37 @@
 
 import os
 import re
+import sys
+import heapq
+import pickle
 import logging
-from typing import List
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, List
 
 import chromadb
+import numpy as np
+import torch
 from chromadb.utils import embedding_functions
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick не установлен — используем regex
+    ahocorasick = None
+
 from config import (
     KNOWLEDGE_BASE_DIR,
     CHROMA_DB_DIR,
+    DOCS_CACHE_PATH,
     CHUNK_SIZE,
     CHUNK_OVERLAP,
     TOP_K_RESULTS,
     EMBEDDING_MODEL,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    VECTOR_MAX_DISTANCE,
 )
 
 logger = logging.getLogger(__name__)
@@ -102,70 +121,184 @@ KEYWORD_FILE_MAP = {
 }
 
 
+def _build_keyword_matcher():
+    """Строит матчер ключевых слов: один проход по запросу вместо цикла по словарю.
+
+    Возвращает функцию query_lower -> set(имена файлов).
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword, filename in KEYWORD_FILE_MAP.items():
+            automaton.add_word(keyword, filename)
+        automaton.make_automaton()
+        return lambda text: {filename for _, filename in automaton.iter(text)}
+
+    # Запасной вариант: одно регулярное выражение с lookahead,
+    # чтобы находить и перекрывающиеся совпадения (как проверка `in`)
+    keywords = sorted(KEYWORD_FILE_MAP, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+    return lambda text: {
+        KEYWORD_FILE_MAP[m.group(1)] for m in pattern.finditer(text)
+    }
+
+
+# Концы предложений, по которым можно разрезать чанк
+_SENTENCE_END_RE = re.compile(r"\.[ \n]|[!?]\n")
+
+
+def _split_into_chunks(text: str, source: str) -> List[dict]:
+    """Разбивает текст на чанки с перекрытием."""
+    chunks = []
+    start = 0
+    chunk_id = 0
+
+    while start < len(text):
+        end = start + CHUNK_SIZE
+
+        # Ищем конец абзаца или предложения для аккуратного разбиения
+        if end < len(text):
+            min_pos = start + CHUNK_SIZE // 2
+            newline_pos = text.rfind("\n\n", start, end)
+            if newline_pos > min_pos:
+                end = newline_pos + 2
+            else:
+                # Последний конец предложения во второй половине окна
+                last_match = None
+                for match in _SENTENCE_END_RE.finditer(text, min_pos + 1, end):
+                    last_match = match
+                if last_match is not None:
+                    end = last_match.end()
+
+        chunk_text = text[start:end].strip()
+
+        if chunk_text:
+            chunks.append({
+                "text": chunk_text,
+                "source": source,
+                "chunk_id": f"{source}_chunk_{chunk_id}",
+            })
+            chunk_id += 1
+
+        start = end - CHUNK_OVERLAP if end < len(text) else end
+
+    return chunks
+
+
+# Слова для лексической проверки релевантности
+_WORD_RE = re.compile(r"\w{4,}")
+
+
+def _word_stems(text: str) -> set:
+    """Грубые основы слов (первые 5 букв), чтобы не зависеть от окончаний."""
+    return {word[:5] for word in _WORD_RE.findall(text.lower())}
+
+
+def _normalize_rows(vectors) -> np.ndarray:
+    """Приводит векторы к единичной длине (косинус = скалярное произведение).
+
+    Результат — непрерывный массив float32: так `@` уходит в BLAS sgemv
+    без приведения типов и копирования.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.ascontiguousarray(vectors / np.maximum(norms, 1e-12), dtype=np.float32)
+
+
+def _read_and_split(filepath: str, filename: str) -> List[dict]:
+    """Читает .md файл и разбивает его на чанки."""
+    with open(filepath, "r", encoding="utf-8") as f:
+        content = f.read()
+    return _split_into_chunks(content, filename)
+
+
 class RAGEngine:
     """RAG движок — загрузка документов, создание эмбеддингов, гибридный поиск."""
 
-    def __init__(self):
-        """Инициализация RAG движка с ChromaDB и sentence-transformers."""
+    def __init__(self, bulk_load: bool = False):
+        """Инициализация RAG движка с ChromaDB и sentence-transformers.
+
+        Args:
+            bulk_load: Режим массовой загрузки (knowledge_loader.py) —
+                отключает журнал и fsync SQLite для быстрой вставки.
+        """
         logger.info("Инициализация RAG движка...")
 
         # Создаём функцию эмбеддингов на основе sentence-transformers
         self.embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name=EMBEDDING_MODEL
+            model_name=EMBEDDING_MODEL,
+            device="cuda" if torch.cuda.is_available() else "cpu",
         )
 
         # Инициализируем ChromaDB с постоянным хранилищем
         self.client = chromadb.PersistentClient(path=CHROMA_DB_DIR)
+        if bulk_load:
+            self._apply_bulk_load_pragmas()
 
         # Получаем или создаём коллекцию
         self.collection = self.client.get_or_create_collection(
             name="satbayev_knowledge",
             embedding_function=self.embedding_fn,
-            metadata={"description": "База знаний Satbayev University для первокурсников"},
+            metadata={
+                "description": "База знаний Satbayev University для первокурсников",
+                # Параметры индекса задаются только при создании коллекции —
+                # после изменения нужно перезапустить knowledge_loader.py.
+                # Параметры поиска (hnsw:search_ef) не задаём: запросы идут
+                # через _vector_search в памяти, а не через индекс ChromaDB
+                "hnsw:space": "cosine",
+                "hnsw:M": 16,
+                "hnsw:construction_ef": 200,
+            },
         )
 
-        # Кэш всех документов для поиска по ключевым словам
+        # Число записей меняется только при загрузке базы — не спрашиваем SQLite на каждый запрос
+        self._count = self.collection.count()
+
+        # Кэш всех документов для прямого поиска по тексту
         self._all_docs_cache = None
+        self._docs_lower = None
+        self._sources = None
+        self._source_chunks = None
+        self._trigram_index = None
+        self._embeddings = None
+        self._docs_cache_lock = threading.Lock()
+        self._load_docs_cache()
+
+        # Матчер ключевых слов строится один раз
+        self._match_keywords = _build_keyword_matcher()
+
+        # LRU-кэш эмбеддингов запросов (частые вопросы не кодируются повторно)
+        self._embed_query = lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)(
+            lambda normalized_query: _normalize_rows(
+                self.embedding_fn([normalized_query])[0]
+            )
+        )
 
         logger.info(
             f"RAG движок инициализирован. "
-            f"Документов в базе: {self.collection.count()}"
+            f"Документов в базе: {self._count}"
         )
 
-    def _split_into_chunks(self, text: str, source: str) -> List[dict]:
-        """Разбивает текст на чанки с перекрытием."""
-        chunks = []
-        start = 0
-        chunk_id = 0
-
-        while start < len(text):
-            end = start + CHUNK_SIZE
-
-            # Ищем конец абзаца или предложения для аккуратного разбиения
-            if end < len(text):
-                newline_pos = text.rfind("\n\n", start, end)
-                if newline_pos > start + CHUNK_SIZE // 2:
-                    end = newline_pos + 2
-                else:
-                    for sep in [". ", ".\n", "!\n", "?\n"]:
-                        sep_pos = text.rfind(sep, start, end)
-                        if sep_pos > start + CHUNK_SIZE // 2:
-                            end = sep_pos + len(sep)
-                            break
-
-            chunk_text = text[start:end].strip()
-
-            if chunk_text:
-                chunks.append({
-                    "text": chunk_text,
-                    "source": source,
-                    "chunk_id": f"{source}_chunk_{chunk_id}",
-                })
-                chunk_id += 1
-
-            start = end - CHUNK_OVERLAP if end < len(text) else end
-
-        return chunks
+    @property
+    def count(self) -> int:
+        """Количество чанков в базе знаний."""
+        return self._count
+
+    def _apply_bulk_load_pragmas(self) -> None:
+        """Настраивает SQLite ChromaDB для быстрой массовой вставки.
+
+        Использует приватный API ChromaDB, поэтому любые ошибки только логируются.
+        """
+        try:
+            conn = self.client._server._sysdb._conn_pool.connect()
+            for pragma in (
+                "PRAGMA journal_mode = OFF",
+                "PRAGMA synchronous = OFF",
+                "PRAGMA temp_store = MEMORY",
+            ):
+                conn.execute(pragma)
+            logger.info("SQLite настроен для массовой загрузки")
+        except Exception as e:
+            logger.warning(f"Не удалось применить SQLite pragma: {e}")
 
     def load_knowledge_base(self) -> dict:
         """Загружает все .md файлы из папки knowledge_base в ChromaDB."""
@@ -192,31 +325,46 @@ class RAGEngine:
         all_chunks = []
         files_processed = 0
 
-        for filename in md_files:
-            filepath = os.path.join(KNOWLEDGE_BASE_DIR, filename)
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    content = f.read()
+        # Читаем и разбиваем файлы параллельно, результаты собираем по порядку
+        with ThreadPoolExecutor() as executor:
+            futures = [
+                executor.submit(
+                    _read_and_split,
+                    os.path.join(KNOWLEDGE_BASE_DIR, filename),
+                    filename,
+                )
+                for filename in md_files
+            ]
 
-                chunks = self._split_into_chunks(content, filename)
-                all_chunks.extend(chunks)
-                files_processed += 1
-                logger.info(f"  + {filename}: {len(chunks)} chunk(s)")
+            for filename, future in zip(md_files, futures):
+                try:
+                    chunks = future.result()
+                    all_chunks.extend(chunks)
+                    files_processed += 1
+                    logger.info(f"  + {filename}: {len(chunks)} chunk(s)")
 
-            except Exception as e:
-                logger.error(f"  ! Error reading {filename}: {e}")
+                except Exception as e:
+                    logger.error(f"  ! Error reading {filename}: {e}")
 
         # Загружаем чанки в ChromaDB
         if all_chunks:
             logger.info(f"Загрузка {len(all_chunks)} чанков в ChromaDB...")
 
-            batch_size = 100
+            # Списки полей строим один раз и дальше только режем на батчи
+            ids = [chunk["chunk_id"] for chunk in all_chunks]
+            documents = [chunk["text"] for chunk in all_chunks]
+            metadatas = [{"source": chunk["source"]} for chunk in all_chunks]
+
+            # Эмбеддинги считаем одним вызовом модели, а не внутри каждого add()
+            embeddings = self.embedding_fn(documents)
+
+            batch_size = 250
             for i in range(0, len(all_chunks), batch_size):
-                batch = all_chunks[i:i + batch_size]
                 self.collection.add(
-                    ids=[chunk["chunk_id"] for chunk in batch],
-                    documents=[chunk["text"] for chunk in batch],
-                    metadatas=[{"source": chunk["source"]} for chunk in batch],
+                    ids=ids[i:i + batch_size],
+                    documents=documents[i:i + batch_size],
+                    embeddings=embeddings[i:i + batch_size],
+                    metadatas=metadatas[i:i + batch_size],
                 )
 
             logger.info(
@@ -225,7 +373,19 @@ class RAGEngine:
             )
 
         # Сбрасываем кэш
+        self._count = self.collection.count()
         self._all_docs_cache = None
+        self._docs_lower = None
+        self._sources = None
+        self._source_chunks = None
+        self._trigram_index = None
+        self._embeddings = None
+        if os.path.exists(DOCS_CACHE_PATH):
+            os.remove(DOCS_CACHE_PATH)
+
+        # Сразу собираем и сохраняем кэш документов и эмбеддингов для бота
+        if all_chunks:
+            self._get_all_docs()
 
         stats = {"files": files_processed, "chunks": len(all_chunks)}
         return stats
@@ -233,35 +393,111 @@ class RAGEngine:
     def _get_all_docs(self) -> dict:
         """Получает все документы из ChromaDB (с кэшированием)."""
         if self._all_docs_cache is None:
-            self._all_docs_cache = self.collection.get(
-                include=["documents", "metadatas"]
-            )
+            # Поиск идёт из нескольких потоков — кэш заполняет только один из них
+            with self._docs_cache_lock:
+                if self._all_docs_cache is None:
+                    all_docs = self.collection.get(
+                        include=["documents", "metadatas", "embeddings"]
+                    )
+                    # Нижний регистр и источники считаем один раз, а не на каждый запрос
+                    self._index_texts([d.lower() for d in all_docs["documents"]])
+                    self._index_sources([m["source"] for m in all_docs["metadatas"]])
+                    self._embeddings = _normalize_rows(all_docs.pop("embeddings"))
+                    # Кэш публикуем последним: проверка выше идёт без блокировки
+                    self._all_docs_cache = all_docs
+                    self._save_docs_cache()
         return self._all_docs_cache
 
+    def _index_texts(self, docs_lower: List[str]) -> None:
+        """Запоминает тексты в нижнем регистре и строит триграммный индекс."""
+        trigram_index = defaultdict(set)
+        for i, doc_lower in enumerate(docs_lower):
+            for j in range(len(doc_lower) - 2):
+                trigram_index[doc_lower[j:j + 3]].add(i)
+        self._docs_lower = docs_lower
+        self._trigram_index = dict(trigram_index)
+
+    def _index_sources(self, sources: List[str]) -> None:
+        """Запоминает источники чанков и строит индекс: файл -> номера чанков."""
+        self._sources = [sys.intern(source) for source in sources]
+        self._source_chunks = {}
+        for i, source in enumerate(self._sources):
+            self._source_chunks.setdefault(source, []).append(i)
+
+    def _load_docs_cache(self) -> None:
+        """Загружает кэш документов с диска, если он соответствует коллекции."""
+        if not os.path.exists(DOCS_CACHE_PATH):
+            return
+
+        try:
+            with open(DOCS_CACHE_PATH, "rb") as f:
+                data = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать кэш документов: {e}")
+            return
+
+        # Кэш устарел — коллекция была перезагружена (или кэш старого формата)
+        if data["count"] != self._count or "embeddings" not in data:
+            return
+
+        self._all_docs_cache = {
+            "documents": data["documents"],
+            "metadatas": [{"source": source} for source in data["sources"]],
+        }
+        self._index_texts(data["docs_lower"])
+        self._index_sources(data["sources"])
+        self._embeddings = np.ascontiguousarray(data["embeddings"], dtype=np.float32)
+        logger.info(f"Кэш документов загружен с диска ({data['count']} записей)")
+
+    def _save_docs_cache(self) -> None:
+        """Сохраняет кэш документов на диск, чтобы не читать ChromaDB после перезапуска."""
+        data = {
+            "count": len(self._sources),
+            "documents": self._all_docs_cache["documents"],
+            "sources": self._sources,
+            "docs_lower": self._docs_lower,
+            "embeddings": self._embeddings,
+        }
+        # Пишем во временный файл и атомарно подменяем кэш, чтобы при сбое
+        # на диске не остался обрезанный файл
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=os.path.dirname(DOCS_CACHE_PATH), delete=False
+            ) as f:
+                tmp_path = f.name
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, DOCS_CACHE_PATH)
+        except Exception as e:
+            logger.warning(f"Не удалось сохранить кэш документов: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
     def _keyword_search(self, query: str) -> List[dict]:
         """Поиск чанков по ключевым словам из запроса."""
         query_lower = query.lower()
-        matched_files = set()
 
-        # Определяем файлы по ключевым словам
-        for keyword, filename in KEYWORD_FILE_MAP.items():
-            if keyword in query_lower:
-                matched_files.add(filename)
+        # Определяем файлы по ключевым словам (один проход по запросу)
+        matched_files = self._match_keywords(query_lower)
 
         if not matched_files:
             return []
 
-        # Достаём все документы и фильтруем по файлам
-        all_docs = self._get_all_docs()
-        results = []
-
-        for i, meta in enumerate(all_docs["metadatas"]):
-            if meta["source"] in matched_files:
-                results.append({
-                    "text": all_docs["documents"][i],
-                    "source": meta["source"],
-                    "distance": 0.5,  # Средний приоритет для keyword-результатов
-                })
+        # Номера чанков берём из индекса по файлам — без просмотра всех документов
+        documents = self._get_all_docs()["documents"]
+        chunk_ids = sorted(
+            i
+            for filename in matched_files
+            for i in self._source_chunks.get(filename, ())
+        )
+        results = [
+            {
+                "text": documents[i],
+                "source": self._sources[i],
+                "distance": 0.5,  # Средний приоритет для keyword-результатов
+            }
+            for i in chunk_ids
+        ]
 
         logger.info(
             f"Keyword search: '{query[:40]}...' -> "
@@ -272,16 +508,33 @@ class RAGEngine:
     def _text_match_search(self, query: str) -> List[dict]:
         """Прямой поиск подстроки в тексте чанков (для имён, названий)."""
         query_lower = query.lower()
-        all_docs = self._get_all_docs()
-        results = []
-
-        for i, doc in enumerate(all_docs["documents"]):
-            if query_lower in doc.lower():
-                results.append({
-                    "text": doc,
-                    "source": all_docs["metadatas"][i]["source"],
-                    "distance": 0.1,  # Высокий приоритет — точное совпадение
-                })
+        documents = self._get_all_docs()["documents"]
+
+        # Кандидаты — чанки, содержащие все триграммы запроса;
+        # короткие запросы проверяем по всем чанкам
+        if len(query_lower) < 3:
+            candidates = range(len(self._docs_lower))
+        else:
+            candidates = None
+            for j in range(len(query_lower) - 2):
+                posting = self._trigram_index.get(query_lower[j:j + 3])
+                if not posting:
+                    candidates = ()
+                    break
+                candidates = posting if candidates is None else candidates & posting
+                if not candidates:
+                    break
+            candidates = sorted(candidates)
+
+        results = [
+            {
+                "text": documents[i],
+                "source": self._sources[i],
+                "distance": 0.1,  # Высокий приоритет — точное совпадение
+            }
+            for i in candidates
+            if query_lower in self._docs_lower[i]
+        ]
 
         if results:
             logger.info(
@@ -289,66 +542,98 @@ class RAGEngine:
             )
         return results
 
+    def _vector_search(self, query: str, top_k: int) -> List[dict]:
+        """Векторный поиск в памяти: косинусная близость по всей матрице эмбеддингов.
+
+        Для базы из сотен чанков полный перебор быстрее, чем HNSW-запрос в ChromaDB.
+        """
+        documents = self._get_all_docs()["documents"]
+        query_embedding = self._embed_query(query.strip().lower())
+
+        # Одно умножение матрицы на вектор (BLAS), затем частичный отбор top-k
+        # и сортировка только этих k элементов
+        scores = self._embeddings @ query_embedding
+        k = min(top_k, len(scores))
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {
+                "text": documents[i],
+                "source": self._sources[i],
+                "distance": float(1.0 - scores[i]),  # Косинусное расстояние
+            }
+            for i in top
+        ]
+
     def search(self, query: str, top_k: int = TOP_K_RESULTS) -> List[dict]:
         """Гибридный поиск: вектор + ключевые слова + прямой текст."""
-        if self.collection.count() == 0:
+        if self._count == 0:
             logger.warning("База знаний пуста! Запустите knowledge_loader.py")
             return []
 
-        # 1. Векторный поиск
-        vector_results = []
-        try:
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=min(top_k, self.collection.count()),
-            )
-            if results and results["documents"] and results["documents"][0]:
-                for i, doc in enumerate(results["documents"][0]):
-                    vector_results.append({
-                        "text": doc,
-                        "source": results["metadatas"][0][i]["source"],
-                        "distance": results["distances"][0][i] if results["distances"] else 1.0,
-                    })
-        except Exception as e:
-            logger.error(f"Ошибка векторного поиска: {e}")
+        # 1. Прямой поиск по тексту (для имён, названий)
+        text_results = self._text_match_search(query)
 
         # 2. Поиск по ключевым словам
         keyword_results = self._keyword_search(query)
 
-        # 3. Прямой поиск по тексту (для имён, названий)
-        text_results = self._text_match_search(query)
-
-        # Объединяем результаты, убирая дубликаты
+        # 3. Векторный поиск — пропускаем, если точных совпадений и
+        # keyword-результатов уже достаточно (эмбеддинг запроса — самое дорогое)
+        vector_results = []
+        distinct_texts = {r["text"] for r in text_results} | {r["text"] for r in keyword_results}
+        if text_results and len(distinct_texts) >= top_k:
+            logger.info("Векторный поиск пропущен: достаточно текстовых совпадений")
+        else:
+            try:
+                vector_results = self._vector_search(query, top_k)
+            except Exception as e:
+                logger.error(f"Ошибка векторного поиска: {e}")
+
+            # Отсекаем нерелевантные векторные результаты, чтобы не тратить
+            # токены LLM: далёкие по расстоянию и без общих слов с запросом.
+            # Если такой чанк найден и по ключевым словам — он вернётся ниже.
+            query_stems = _word_stems(query)
+            check_overlap = len(query_stems) > 3
+            vector_results = [
+                r for r in vector_results
+                if r["distance"] <= VECTOR_MAX_DISTANCE
+                and (not check_overlap or query_stems & _word_stems(r["text"]))
+            ]
+
+        # Объединяем результаты, убирая дубликаты по полному тексту чанка
+        # (хэш строки считается в C и кэшируется в самом объекте str)
         seen_texts = set()
         combined = []
 
         # Сначала точные совпадения текста (высший приоритет)
         for r in text_results:
-            text_key = r["text"][:100]
+            text_key = r["text"]
             if text_key not in seen_texts:
                 seen_texts.add(text_key)
                 combined.append(r)
 
         # Затем векторные результаты
         for r in vector_results:
-            text_key = r["text"][:100]
+            text_key = r["text"]
             if text_key not in seen_texts:
                 seen_texts.add(text_key)
                 combined.append(r)
 
         # Затем keyword-результаты
         for r in keyword_results:
-            text_key = r["text"][:100]
+            text_key = r["text"]
             if text_key not in seen_texts:
                 seen_texts.add(text_key)
                 combined.append(r)
 
-        # Сортируем: сначала точные совпадения, потом по расстоянию
-        combined.sort(key=lambda x: x["distance"])
-
-        # Ограничиваем количество (но берём больше чем top_k для keyword)
+        # Берём лучшие по расстоянию: сначала точные совпадения
+        # (берём больше чем top_k для keyword)
         max_results = max(top_k, 10)
-        combined = combined[:max_results]
+        combined = heapq.nsmallest(max_results, combined, key=lambda x: x["distance"])
 
         logger.info(
             f"Гибридный поиск '{query[:50]}...' -> "
@@ -357,17 +642,21 @@ class RAGEngine:
         )
         return combined
 
-    def get_context(self, query: str) -> str:
-        """Получает объединённый контекст из релевантных чанков."""
+    def iter_context(self, query: str) -> Iterator[str]:
+        """Отдаёт контекст по частям — по одному фрагменту на найденный чанк.
+
+        Позволяет передавать контекст потребителю без сборки одной большой строки.
+        """
         results = self.search(query)
 
         if not results:
-            return "Информация по данному запросу не найдена в базе знаний."
+            yield "Информация по данному запросу не найдена в базе знаний."
+            return
 
-        context_parts = []
         for i, result in enumerate(results, 1):
-            context_parts.append(
-                f"[Источник {i}: {result['source']}]\n{result['text']}"
-            )
+            separator = "\n\n---\n\n" if i > 1 else ""
+            yield f"{separator}[Источник {i}: {result['source']}]\n{result['text']}"
 
-        return "\n\n---\n\n".join(context_parts)
+    def get_context(self, query: str) -> str:
+        """Получает объединённый контекст из релевантных чанков."""
+        return "".join(self.iter_context(query))